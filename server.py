@@ -7,69 +7,207 @@ startup.
 """
 
 import argparse
+import asyncio
 import base64
 import datetime as _dt
+import functools
+import http.client
+import io
 import logging
 import mimetypes
 import os
-import textwrap
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
-from typing import Dict
+import queue
+import socket
+import sys
+import threading
+import time
+from email.utils import formatdate
+from http import HTTPStatus
+from typing import Optional, Sequence, Tuple
+
+try:
+    import pybase64
+except ImportError:  # optional: SIMD-accelerated base64
+    pybase64 = None
+
+try:
+    import uvloop
+except ImportError:  # optional: faster event loop
+    uvloop = None
 
 DEFAULT_HOST = "0.0.0.0"
 DEFAULT_PORT = 6565
 
+# Request headers in arrival order, duplicates preserved.
+Headers = Sequence[Tuple[str, str]]
+
+# Log file writes are coalesced until this many bytes are pending or
+# LOG_FLUSH_INTERVAL seconds have passed since the oldest pending record.
+# Overridable at startup via the LOG_SERVER_FLUSH_BYTES environment variable.
+LOG_FLUSH_BYTES = 2 * 1024 * 1024
+LOG_FLUSH_INTERVAL = 0.05
+
+# Requests declaring a larger Content-Length are rejected with 413.
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+# Requests waiting to be formatted are capped by count and by total body
+# size; once either cap is reached, new requests wait for room before they
+# are answered.
+LOG_QUEUE_SIZE = 1024
+LOG_QUEUE_MAX_BYTES = 2 * MAX_BODY_BYTES
+
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
 
 # ---- helpers -------------------------------------------------------------
 
+def _b64encode(data: bytes) -> str:
+    """Base64-encode bytes to str, using pybase64 when available."""
+    if pybase64 is not None:
+        return pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
+
+class _Lazy:
+    """Defer building a log message until a handler formats it."""
+
+    __slots__ = ("_fn", "_args", "_value")
+
+    def __init__(self, fn, *args):
+        self._fn = fn
+        self._args = args
+        self._value = None
+
+    def __str__(self) -> str:
+        if self._value is None:
+            self._value = self._fn(*self._args)
+        return self._value
+
+
 def _shell_quote(value: str) -> str:
     """Return a shell-safe single-quoted string."""
     return "'" + value.replace("'", "'\\''") + "'"
 
 
-def build_curl(method: str, url: str, headers: Dict[str, str], body: bytes) -> str:
+# Header lines repeat heavily across requests (User-Agent, Accept, ...), so
+# their quoted form is cached. Long lines, credentials and per-request values
+# bypass the cache so it neither pins client data nor churns.
+_HEADER_CACHE_MAX_CHARS = 256
+_UNCACHED_HEADERS = frozenset({
+    "authorization",
+    "proxy-authorization",
+    "cookie",
+    "content-length",
+    "host",
+    "x-request-id",
+    "x-correlation-id",
+    "traceparent",
+})
+_shell_quote_cached = functools.lru_cache(maxsize=4096)(_shell_quote)
+
+
+def _shell_quote_header(key: str, sep: str, val: str) -> str:
+    line = f"{key}{sep}{val}"
+    if len(line) > _HEADER_CACHE_MAX_CHARS or key.lower() in _UNCACHED_HEADERS:
+        return _shell_quote(line)
+    return _shell_quote_cached(line)
+
+
+def decode_body(body: bytes) -> Tuple[str, bool]:
+    """Decode a request body once for logging and replay.
+
+    Returns ``(text, is_utf8)``; bodies that are not valid UTF-8 are decoded
+    as latin1 so every byte survives the round trip.
+    """
+    if not body:
+        return "", True
+    try:
+        return body.decode("utf-8"), True
+    except UnicodeDecodeError:
+        return body.decode("latin1"), False
+
+
+def _indent4(text: str) -> str:
+    """Indent every line of ``text`` by four spaces."""
+    return "    " + text.replace("\n", "\n    ")
+
+
+_REQUESTS_TEMPLATE = """\
+import requests
+
+url = {url}
+headers = {headers}
+data = {data}
+
+resp = requests.request({method}, url, headers=headers, data=data)
+print(resp.status_code)
+print(resp.text)"""
+
+_REQUESTS_TEMPLATE_NO_DATA = """\
+import requests
+
+url = {url}
+headers = {headers}
+
+resp = requests.request({method}, url, headers=headers)
+print(resp.status_code)
+print(resp.text)"""
+
+
+def build_curl(method: str, url: str, headers: Headers, body_text: str, body_is_text: bool) -> str:
     parts = ["curl", "-i", "-X", method]
-    for key, val in headers.items():
-        parts.extend(["-H", _shell_quote(f"{key}: {val}")])
-    if body:
-        try:
-            body_text = body.decode("utf-8")
-            parts.extend(["--data-raw", _shell_quote(body_text)])
-        except UnicodeDecodeError:
-            parts.extend(["--data-binary", _shell_quote(body.decode("latin1"))])
+    for key, val in headers:
+        parts.extend(["-H", _shell_quote_header(key, ": ", val)])
+    if body_text:
+        parts.extend(["--data-raw" if body_is_text else "--data-binary", _shell_quote(body_text)])
     parts.append(_shell_quote(url))
     return " ".join(parts)
 
 
-def build_httpie(method: str, url: str, headers: Dict[str, str], body: bytes) -> str:
+def build_httpie(method: str, url: str, headers: Headers, body_text: str, body_is_text: bool) -> str:
     parts = ["http", "-v", method, _shell_quote(url)]
-    for key, val in headers.items():
-        parts.append(_shell_quote(f"{key}:{val}"))
-    if body:
-        try:
-            body_text = body.decode("utf-8")
-            parts.extend(["--raw", _shell_quote(body_text)])
-        except UnicodeDecodeError:
-            parts.extend(["--raw", _shell_quote(body.decode("latin1"))])
+    for key, val in headers:
+        parts.append(_shell_quote_header(key, ":", val))
+    if body_text:
+        parts.extend(["--raw", _shell_quote(body_text)])
     return " ".join(parts)
 
 
-def build_python_requests(method: str, url: str, headers: Dict[str, str], body: bytes) -> str:
-    # Use latin1 to preserve byte-for-byte round‑trip if not valid UTF-8.
-    body_literal = repr(body.decode("utf-8", errors="backslashreplace"))
-    headers_literal = repr(headers)
-    snippet = f"""
-import requests
+def python_body_literal(body_text: str, body_is_text: bool) -> Optional[str]:
+    """Return the ``data=`` literal for the python_requests snippet, or None for no body."""
+    if not body_text:
+        return None
+    if not body_is_text:
+        # Show undecodable bytes as \x escapes rather than latin1 characters.
+        body_text = body_text.encode("latin1").decode("utf-8", errors="backslashreplace")
+    return repr(body_text)
+
+
+def build_python_requests(method: str, url: str, headers_repr: str, body_literal: Optional[str]) -> str:
+    if body_literal is None:
+        return _REQUESTS_TEMPLATE_NO_DATA.format(url=repr(url), headers=headers_repr, method=repr(method))
+    return _REQUESTS_TEMPLATE.format(
+        url=repr(url),
+        headers=headers_repr,
+        data=body_literal,
+        method=repr(method),
+    )
 
-url = {repr(url)}
-headers = {headers_literal}
-data = {body_literal}
 
-resp = requests.request({repr(method)}, url, headers=headers, data=data)
-print(resp.status_code)
-print(resp.text)
-"""
-    return textwrap.dedent(snippet).strip()
+REPLAY_FORMATS = ("curl", "httpie", "python_requests")
+
+
+def parse_replay_formats(value: str) -> tuple:
+    names = tuple(name.strip() for name in value.split(",") if name.strip())
+    unknown = [name for name in names if name not in REPLAY_FORMATS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown replay format(s): {', '.join(unknown)} (choose from {', '.join(REPLAY_FORMATS)})"
+        )
+    return names
 
 
 def ensure_log_dir(path: str) -> None:
@@ -78,74 +216,350 @@ def ensure_log_dir(path: str) -> None:
         os.makedirs(directory, exist_ok=True)
 
 
-# ---- request handler -----------------------------------------------------
+# ---- log handler ---------------------------------------------------------
+
+class BackgroundFileHandler(logging.Handler):
+    """Append log records to a file from a dedicated writer thread.
 
-class LoggingHandler(BaseHTTPRequestHandler):
-    server_version = "LogServer/1.0"
+    ``emit`` only formats and enqueues the encoded record, so request threads
+    never block on disk I/O. The writer coalesces pending records and flushes
+    them with a single ``writev`` once ``flush_bytes`` are pending or
+    ``flush_interval`` seconds have passed.
+    """
 
-    def _read_body(self) -> bytes:
-        length_str = self.headers.get("Content-Length")
-        if not length_str:
-            return b""
+    def __init__(
+        self,
+        filename: str,
+        encoding: str = "utf-8",
+        flush_bytes: int = LOG_FLUSH_BYTES,
+        flush_interval: float = LOG_FLUSH_INTERVAL,
+    ):
+        super().__init__()
+        self.encoding = encoding
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._fd = os.open(filename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._queue: "queue.SimpleQueue[bytes | None]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._writer.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
         try:
-            length = int(length_str)
-        except ValueError:
-            length = 0
-        return self.rfile.read(length) if length > 0 else b""
+            data = (self.format(record) + "\n").encode(self.encoding)
+        except Exception:
+            self.handleError(record)
+            return
+        self._queue.put(data)
+
+    def _run(self) -> None:
+        while True:
+            data = self._queue.get()
+            if data is None:
+                return
+            batch = [data]
+            pending = len(data)
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while pending < self.flush_bytes:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        data = self._queue.get(timeout=remaining)
+                    else:
+                        data = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if data is None:
+                    stop = True
+                    break
+                batch.append(data)
+                pending += len(data)
+            try:
+                self._write_batch(batch)
+            except OSError:
+                # Report and keep draining, as FileHandler would; the failed
+                # batch is dropped.
+                self.handleError(
+                    logging.makeLogRecord({"msg": "failed to write %d log record(s)", "args": (len(batch),)})
+                )
+            if stop:
+                return
+
+    def _write_batch(self, batch: "list[bytes]") -> None:
+        for start in range(0, len(batch), _IOV_MAX):
+            chunks = batch[start:start + _IOV_MAX]
+            if hasattr(os, "writev"):
+                written = os.writev(self._fd, chunks)
+            else:
+                written = 0
+            total = sum(len(chunk) for chunk in chunks)
+            if written < total:
+                rest = memoryview(b"".join(chunks))[written:]
+                while rest:
+                    rest = rest[os.write(self._fd, rest):]
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self._writer.is_alive():
+                self._queue.put(None)
+                self._writer.join()
+            if self._fd >= 0:
+                try:
+                    os.close(self._fd)
+                except OSError:
+                    pass
+                self._fd = -1
+        finally:
+            self.release()
+        super().close()
 
-    def _respond(self):
-        body = self._read_body()
-        host_header = self.headers.get(
-            "Host", f"{self.server.server_name}:{self.server.server_port}"
-        )
-        full_url = f"http://{host_header}{self.path}"
-        self.server.log_request(  # type: ignore[attr-defined]
-            method=self.command,
-            path=self.path,
-            url=full_url,
-            headers={k: v for k, v in self.headers.items()},
-            body=body,
-            client=self.client_address[0],
-        )
 
-        self.send_response(200)
-        self.send_header("Content-Type", self.server.response_content_type)  # type: ignore[attr-defined]
-        self.send_header("Content-Length", str(len(self.server.response_body)))  # type: ignore[attr-defined]
-        self.end_headers()
-        self.wfile.write(self.server.response_body)  # type: ignore[attr-defined]
+# ---- request handler -----------------------------------------------------
+
+SERVER_VERSION = f"LogServer/1.0 Python/{sys.version.split()[0]}"
+SUPPORTED_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+MAX_HEADERS = 100
+# Connections that send nothing for this many seconds while a request is
+# being read are closed without a response.
+READ_TIMEOUT = 30.0
 
-    # Map all methods to the same handler.
-    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _respond
 
-    def log_message(self, format: str, *args) -> None:  # noqa: A003
-        # Silence BaseHTTPRequestHandler default logging; we handle logging ourselves.
-        return
+def _status_response(code: int) -> bytes:
+    """Return a complete, body-less HTTP/1.0 response for an error status."""
+    status = HTTPStatus(code)
+    return (
+        f"HTTP/1.0 {status.value} {status.phrase}\r\n"
+        f"Server: {SERVER_VERSION}\r\n"
+        f"Date: {formatdate(usegmt=True)}\r\n"
+        "Connection: close\r\n"
+        "Content-Length: 0\r\n\r\n"
+    ).encode("latin1")
+
+
+async def handle_connection(server: "LogServer", reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Serve a single HTTP/1.0 request and close the connection."""
+    try:
+        # Written piecewise so the shared response body is never copied.
+        for chunk in await _handle_request(server, reader, writer):
+            writer.write(chunk)
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def _read_header_block(reader: asyncio.StreamReader) -> bytes:
+    """Read header lines up to the blank line, accepting CRLF or bare LF.
+
+    As in http.server, an overlong line raises ValueError and more than
+    MAX_HEADERS lines raise HTTPException.
+    """
+    lines = []
+    while True:
+        line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+        lines.append(line)
+        if line in (b"\r\n", b"\n", b""):
+            return b"".join(lines)
+        if len(lines) > MAX_HEADERS:
+            raise http.client.HTTPException(f"got more than {MAX_HEADERS} headers")
+
+
+def _parse_http_version(version: str) -> Optional[Tuple[int, int]]:
+    """Parse ``HTTP/major.minor`` as BaseHTTPRequestHandler.parse_request does."""
+    if not version.startswith("HTTP/"):
+        return None
+    parts = version[5:].split(".")
+    if len(parts) != 2 or any(not part.isdigit() or len(part) > 10 for part in parts):
+        return None
+    return int(parts[0]), int(parts[1])
+
+
+async def _handle_request(
+    server: "LogServer", reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> Tuple[bytes, ...]:
+    """Read one request, queue it for logging and return the response chunks."""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), READ_TIMEOUT)
+    except ValueError:
+        return (_status_response(414),)
+    words = request_line.decode("latin1").split()
+    if not words:
+        return ()
+    if len(words) == 3:
+        method, path, version = words
+        version_number = _parse_http_version(version)
+        if version_number is None:
+            return (_status_response(400),)
+        if version_number >= (2, 0):
+            return (_status_response(505),)
+    elif len(words) == 2 and words[0] == "GET":
+        # HTTP/0.9: like http.server, answer with the bare body.
+        method, path = words
+        version = "HTTP/0.9"
+    else:
+        return (_status_response(400),)
+    try:
+        headers = http.client.parse_headers(io.BytesIO(await _read_header_block(reader)))
+    except (ValueError, http.client.HTTPException):
+        return (_status_response(431),)
+    if method not in SUPPORTED_METHODS:
+        return (_status_response(501),)
+
+    length_str = headers.get("Content-Length")
+    try:
+        length = int(length_str) if length_str else 0
+    except ValueError:
+        length = 0
+    if length > MAX_BODY_BYTES:
+        return (_status_response(413),)
+    # Fill one preallocated buffer instead of regrowing it per chunk.
+    body = bytearray(max(length, 0))
+    view = memoryview(body)
+    received = 0
+    while received < length:
+        chunk = await asyncio.wait_for(reader.read(length - received), READ_TIMEOUT)
+        if not chunk:
+            break
+        view[received:received + len(chunk)] = chunk
+        received += len(chunk)
+    view.release()
+    if received < len(body):
+        del body[received:]
+
+    host_header = headers.get("Host", server.default_host)
+    await server.log_request(
+        method=method,
+        path=path,
+        url=f"http://{host_header}{path}",
+        headers=headers.items(),
+        body=body,
+        client=writer.get_extra_info("peername")[0],
+    )
+    if version == "HTTP/0.9":
+        return (server.response_body,)
+    head = server.response_head + formatdate(usegmt=True).encode("ascii") + server.response_tail
+    return (head, server.response_body)
 
 
 # ---- server wrapper ------------------------------------------------------
 
-class LogServer(ThreadingHTTPServer):
+class LogServer:
     def __init__(
         self,
         server_address,
-        handler_cls,
         response_body: bytes,
         content_type: str,
         logger: logging.Logger,
         max_log_body_chars: int,
+        replay_formats: tuple = REPLAY_FORMATS,
     ):
-        super().__init__(server_address, handler_cls)
+        host, port = server_address
+        # Bind eagerly so address errors surface before the server is announced.
+        self.socket = socket.create_server(server_address, backlog=1024)
+        self.default_host = f"{socket.getfqdn(host)}:{self.socket.getsockname()[1]}"
         self.response_body = response_body
         self.response_content_type = content_type
+        # Every header but Date is fixed, so the response head is precomposed
+        # around it once; the body is sent separately, uncopied.
+        self.response_head = (
+            f"HTTP/1.0 200 OK\r\nServer: {SERVER_VERSION}\r\nDate: "
+        ).encode("latin1")
+        self.response_tail = (
+            f"\r\nContent-Type: {content_type}\r\nContent-Length: {len(response_body)}\r\n\r\n"
+        ).encode("latin1")
         self.logger = logger
         self.max_log_body_chars = max_log_body_chars
-        self.allow_reuse_address = True
-
-    def log_request(self, method: str, path: str, url: str, headers: Dict[str, str], body: bytes, client: str):
+        # Keep the canonical order regardless of how formats were listed.
+        self.replay_formats = tuple(name for name in REPLAY_FORMATS if name in replay_formats)
+        # Requests are formatted and logged on a dedicated thread so that
+        # the event loop only pays for an enqueue before responding.
+        self._log_queue: "queue.SimpleQueue[tuple | None]" = queue.SimpleQueue()
+        self._log_lock = threading.Lock()
+        self._queued_requests = 0
+        self._queued_body_bytes = 0
+        # Set from the formatter thread (via the loop) whenever room frees up.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._log_room: Optional[asyncio.Event] = None
+        self._log_thread = threading.Thread(target=self._drain_log_queue, name="log-formatter", daemon=True)
+        self._log_thread.start()
+
+    async def serve_forever(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._log_room = asyncio.Event()
+        server = await asyncio.start_server(
+            functools.partial(handle_connection, self), sock=self.socket
+        )
+        async with server:
+            await server.serve_forever()
+
+    def server_close(self) -> None:
+        self.socket.close()
+        if self._log_thread.is_alive():
+            self._log_queue.put(None)
+            self._log_thread.join()
+
+    async def log_request(self, method: str, path: str, url: str, headers: Headers, body: bytes, client: str):
+        # Skip the enqueue and all formatting while INFO is muted.
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         timestamp = _dt.datetime.now().isoformat(timespec="seconds")
-
-        body_utf8_full = body.decode("utf-8", errors="replace") if body else ""
-        body_b64_full = base64.b64encode(body).decode("ascii") if body else ""
+        # Backpressure: hold the request until the formatter has room for it.
+        while not self._reserve_log_slot(len(body)):
+            self._log_room.clear()
+            await self._log_room.wait()
+        self._log_queue.put((timestamp, method, path, url, headers, body, client))
+
+    def _reserve_log_slot(self, size: int) -> bool:
+        with self._log_lock:
+            if self._queued_requests and (
+                self._queued_requests >= LOG_QUEUE_SIZE
+                or self._queued_body_bytes + size > LOG_QUEUE_MAX_BYTES
+            ):
+                return False
+            self._queued_requests += 1
+            self._queued_body_bytes += size
+            return True
+
+    def _drain_log_queue(self) -> None:
+        while True:
+            item = self._log_queue.get()
+            if item is None:
+                return
+            # The record is only rendered if a handler actually emits it.
+            self.logger.info("%s", _Lazy(self._format_request, *item))
+            with self._log_lock:
+                self._queued_requests -= 1
+                self._queued_body_bytes -= len(item[5])
+            if self._loop is None:
+                continue
+            try:
+                self._loop.call_soon_threadsafe(self._log_room.set)
+            except RuntimeError:
+                # The event loop has already shut down; nobody is waiting.
+                pass
+
+    def _format_request(
+        self,
+        timestamp: str,
+        method: str,
+        path: str,
+        url: str,
+        headers: Headers,
+        body: bytes,
+        client: str,
+    ) -> str:
+        body_text, body_is_text = decode_body(body)
+        if body_is_text:
+            body_utf8_full = body_text
+        else:
+            body_utf8_full = body.decode("utf-8", errors="replace")
+        body_b64_full = _b64encode(body) if body else ""
 
         limit = self.max_log_body_chars
 
@@ -154,41 +568,36 @@ class LogServer(ThreadingHTTPServer):
                 return text
             return f"{text[:limit]}... [truncated, total {len(text)} chars]"
 
-        body_utf8 = _truncate(body_utf8_full)
-        body_b64 = _truncate(body_b64_full)
-
-        curl_cmd = build_curl(method, url, headers, body)
-        httpie_cmd = build_httpie(method, url, headers, body)
-        requests_snippet = build_python_requests(method, url, headers, body)
-
-        curl_cmd_log = _truncate(curl_cmd)
-        httpie_cmd_log = _truncate(httpie_cmd)
-        requests_snippet_log = _truncate(requests_snippet)
-
-        headers_block = "\n".join(f"  - {k}: {v}" for k, v in headers.items()) or "  - (none)"
-
-        lines = [
-            f"----- REQUEST START {timestamp} -----",
-            f"client: {client}",
-            f"method: {method}",
-            f"path: {path}",
-            f"url: {url}",
-            "headers:",
-            headers_block,
-            "body:",
-            f"  length: {len(body)} bytes",
-            f"  utf8: {body_utf8}",
-            f"  base64: {body_b64}",
-            "replay:",
-            "  curl: |",
-            textwrap.indent(curl_cmd_log, "    "),
-            "  httpie: |",
-            textwrap.indent(httpie_cmd_log, "    "),
-            "  python_requests: |",
-            textwrap.indent(requests_snippet_log, "    "),
-            f"----- REQUEST END {timestamp} -----\n",
-        ]
-        self.logger.info("\n".join(lines))
+        out = io.StringIO()
+        w = out.write
+        w(f"----- REQUEST START {timestamp} -----\n")
+        w(f"client: {client}\nmethod: {method}\npath: {path}\nurl: {url}\nheaders:\n")
+        if headers:
+            for key, val in headers:
+                w(f"  - {key}: {val}\n")
+        else:
+            w("  - (none)\n")
+        w(f"body:\n  length: {len(body)} bytes\n")
+        w(f"  utf8: {_truncate(body_utf8_full)}\n")
+        w(f"  base64: {_truncate(body_b64_full)}\n")
+        if self.replay_formats:
+            w("replay:\n")
+            for name in self.replay_formats:
+                if name == "curl":
+                    snippet = build_curl(method, url, headers, body_text, body_is_text)
+                elif name == "httpie":
+                    snippet = build_httpie(method, url, headers, body_text, body_is_text)
+                else:
+                    headers_repr = repr(dict(headers))
+                    snippet = build_python_requests(
+                        method, url, headers_repr, python_body_literal(body_text, body_is_text)
+                    )
+                snippet = _truncate(snippet)
+                w(f"  {name}: |\n")
+                w(_indent4(snippet))
+                w("\n")
+        w(f"----- REQUEST END {timestamp} -----\n")
+        return out.getvalue()
 
 
 # ---- cli entry -----------------------------------------------------------
@@ -217,6 +626,12 @@ def parse_args() -> argparse.Namespace:
         default=1000,
         help="Truncate logged body/base64/replay bodies to this many characters (0 or negative disables truncation)",
     )
+    parser.add_argument(
+        "--replay-formats",
+        type=parse_replay_formats,
+        default=REPLAY_FORMATS,
+        help=f"Comma-separated replay snippets to log (default: {','.join(REPLAY_FORMATS)}; empty disables replay)",
+    )
     parser.add_argument(
         "--clear-log",
         action="store_true",
@@ -227,10 +642,21 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional Content-Type for responses. If omitted, guessed from file or defaults to text/plain; charset=utf-8",
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    flush_bytes = os.environ.get("LOG_SERVER_FLUSH_BYTES")
+    args.log_flush_bytes = LOG_FLUSH_BYTES
+    if flush_bytes is not None:
+        try:
+            args.log_flush_bytes = int(flush_bytes)
+            if args.log_flush_bytes < 0:
+                raise ValueError(flush_bytes)
+        except ValueError:
+            parser.error(f"LOG_SERVER_FLUSH_BYTES must be a non-negative integer, got {flush_bytes!r}")
+    return args
 
 
-def configure_logger(log_path: str) -> logging.Logger:
+def configure_logger(log_path: str, flush_bytes: int = LOG_FLUSH_BYTES) -> logging.Logger:
     ensure_log_dir(log_path)
     logger = logging.getLogger("log_server")
     logger.setLevel(logging.INFO)
@@ -239,7 +665,7 @@ def configure_logger(log_path: str) -> logging.Logger:
     if logger.handlers:
         return logger
 
-    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler = BackgroundFileHandler(log_path, encoding="utf-8", flush_bytes=flush_bytes)
     stream_handler = logging.StreamHandler()
 
     formatter = logging.Formatter("%(message)s")
@@ -276,15 +702,15 @@ def main():
         ensure_log_dir(args.log_file)
         open(args.log_file, "w").close()
 
-    logger = configure_logger(args.log_file)
+    logger = configure_logger(args.log_file, args.log_flush_bytes)
 
     server = LogServer(
         (args.host, args.port),
-        LoggingHandler,
         response_body,
         content_type,
         logger,
         args.max_log_body_chars,
+        args.replay_formats,
     )
 
     logger.info(
@@ -294,8 +720,10 @@ def main():
         os.path.abspath(args.response_file),
         content_type,
     )
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
-        server.serve_forever()
+        asyncio.run(server.serve_forever())
     except KeyboardInterrupt:
         logger.info("Stopping server")
     finally: